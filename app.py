@@ -1,4 +1,4 @@
-import os
+import os, asyncio
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from databases import Database
@@ -11,21 +11,47 @@ if not DATABASE_URL:
 
 app = FastAPI(title="Bricktickler → Dossier", version="1.0.0")
 
+# Pool sizing (override via env)
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "10"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "30"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "10"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "200"))
+
+# databases runs every postgresql URL on asyncpg; these go to asyncpg.create_pool
+pool_options = {
+    "min_size": DB_POOL_MIN,
+    "max_size": DB_POOL_MAX,
+    "timeout": DB_POOL_TIMEOUT,             # connect timeout per new connection
+                                            # (acquire timeout: routers.exo.pooled)
+    "command_timeout": DB_COMMAND_TIMEOUT,  # per-statement timeout
+    # prepared statements cached per connection, keyed by SQL text; the routers'
+    # module-level text() queries keep that text stable so each is parsed once
+    "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+}
+
 # One Database instance for the whole app
-database = Database(DATABASE_URL)
+database = Database(DATABASE_URL, **pool_options)
 
 @app.on_event("startup")
 async def startup():
     await database.connect()
+    # Warm the pool so the first requests don't pay connect/TLS cost
+    await asyncio.wait_for(
+        asyncio.gather(*[database.execute("SELECT 1") for _ in range(DB_POOL_MIN)]),
+        timeout=DB_POOL_TIMEOUT * 2,
+    )
     app.state.db = database   # <-- make it available to routers
+    start_event_writer(database)
 
 @app.on_event("shutdown")
 async def shutdown():
+    await stop_event_writer(database)
     await database.disconnect()
 
 # Static pages
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Routers
-from routers.exo import exo_router
+from routers.exo import exo_router, start_event_writer, stop_event_writer
 app.include_router(exo_router)
@@ -0,0 +1,3 @@
+-- Intake relies on INSERT ... ON CONFLICT (idempotency_key) DO NOTHING
+CREATE UNIQUE INDEX IF NOT EXISTS uq_exo_blocks_staging_idempotency_key
+    ON exo_blocks_staging (idempotency_key);
@@ -0,0 +1,9 @@
+-- GET /exo/staging: filter by review_status, keyset on (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_staging_review_created
+    ON exo_blocks_staging (review_status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_staging_created
+    ON exo_blocks_staging (created_at DESC, id DESC);
+
+-- GET /exo/staging/export: review_status='APPROVED' ORDER BY reviewed_at DESC
+CREATE INDEX IF NOT EXISTS idx_staging_review_reviewed
+    ON exo_blocks_staging (review_status, reviewed_at DESC);
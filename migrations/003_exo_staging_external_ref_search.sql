@@ -0,0 +1,8 @@
+-- GET /exo/staging?external_ref=...   (ILIKE '%...%') -> trigram GIN
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_staging_extref_trgm
+    ON exo_blocks_staging USING gin (external_ref gin_trgm_ops);
+
+-- GET /exo/staging?external_ref_prefix=...   (LIKE '...%') -> B-tree
+CREATE INDEX IF NOT EXISTS idx_staging_extref_prefix
+    ON exo_blocks_staging (external_ref text_pattern_ops);
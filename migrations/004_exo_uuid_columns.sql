@@ -0,0 +1,24 @@
+-- Handlers bind uuid.UUID values directly (asyncpg binary codec, no text round-trip),
+-- so every id-like column they compare or insert into must be uuid.
+DO $$
+DECLARE
+    col record;
+BEGIN
+    FOR col IN
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND (table_name, column_name) IN (
+              ('exo_blocks_staging', 'id'),
+              ('exo_blocks_staging', 'builder_id'),
+              ('exo_blocks_staging', 'org_id'),
+              ('exo_blocks_staging', 'reviewer_id'),
+              ('exo_block_events', 'id'),
+              ('exo_block_events', 'block_id')
+          )
+          AND data_type <> 'uuid'
+    LOOP
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN %I TYPE uuid USING %I::uuid',
+                       col.table_name, col.column_name, col.column_name);
+    END LOOP;
+END $$;
@@ -0,0 +1,20 @@
+-- Intake binds aware datetimes directly (asyncpg binary timestamptz codec).
+-- Existing naive values are taken as UTC. exo_blocks is converted too: approval
+-- copies built_at/cured_at/installed_at across, and a timestamptz -> timestamp
+-- assignment would shift them by the session TimeZone.
+DO $$
+DECLARE
+    col record;
+BEGIN
+    FOR col IN
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name IN ('exo_blocks_staging', 'exo_blocks')
+          AND column_name IN ('built_at', 'cured_at', 'installed_at', 'created_at', 'updated_at', 'reviewed_at')
+          AND data_type = 'timestamp without time zone'
+    LOOP
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN %I TYPE timestamptz USING %I AT TIME ZONE ''UTC''',
+                       col.table_name, col.column_name, col.column_name);
+    END LOOP;
+END $$;
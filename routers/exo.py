@@ -1,35 +1,186 @@
 # routers/exo.py
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
-from pydantic import BaseModel, Field
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from typing import List, Optional
 from datetime import datetime
-import os, hmac, hashlib, uuid, json
-from sqlalchemy import text
+import os, re, hmac, hashlib, uuid, asyncio, logging, json
+import orjson
+import jwt
+from blake3 import blake3
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from sqlalchemy import Uuid, bindparam, text
 from databases import Database
 
 exo_router = APIRouter(prefix="/exo", tags=["exo"])
+logger = logging.getLogger(__name__)
 
 # --- Security helpers ---
 HMAC_SECRET = os.getenv("EXO_BUILDER_HMAC", "CHANGE_ME")
-def verify_hmac(raw: bytes, sig: str) -> bool:
-    mac = hmac.new(HMAC_SECRET.encode(), raw, hashlib.sha256).hexdigest()
-    return hmac.compare_digest(mac, sig or "")
+_HMAC_KEY: bytes = HMAC_SECRET.encode()
+# "sha256" = HMAC-SHA256 (what builders.html sends); "blake2b" = keyed BLAKE2b-256
+HMAC_ALGO = os.getenv("EXO_HMAC_ALGO", "sha256").lower()
+if HMAC_ALGO not in ("sha256", "blake2b"):
+    raise RuntimeError(f"EXO_HMAC_ALGO must be sha256 or blake2b, got {HMAC_ALGO!r}")
+# BLAKE2b keys max out at 64 bytes; hash longer secrets down (as HMAC does) rather
+# than truncating, so secrets differing past byte 64 still give different MACs.
+_B2_KEY: bytes = _HMAC_KEY if len(_HMAC_KEY) <= 64 else hashlib.blake2b(_HMAC_KEY).digest()
+def new_hmac():
+    if HMAC_ALGO == "blake2b":
+        return hashlib.blake2b(digest_size=32, key=_B2_KEY)
+    return hmac.new(_HMAC_KEY, digestmod=hashlib.sha256)
+
+# X-Signature-B3: keyed BLAKE3 over the raw body. The 32-byte key is derived from
+# EXO_BUILDER_HMAC with blake3 derive_key mode and the context string below.
+B3_CONTEXT = "bricktickler exo intake 2025 X-Signature-B3"
+_B3_KEY: bytes = blake3(_HMAC_KEY, derive_key_context=B3_CONTEXT).digest()
+def new_b3_mac():
+    return blake3(key=_B3_KEY)
+
+def signature_ok(mac, sig: str) -> bool:
+    try:
+        provided = bytes.fromhex(sig or "")
+    except ValueError:
+        return False
+    return hmac.compare_digest(mac.digest(), provided)
+
 def get_db(request: Request):
     db = getattr(request.app.state, "db", None)
     if not db:
         raise HTTPException(500, "DB not initialized")
     return db
 
-def manager_auth(_: Request):
-    return True
+# databases acquires from the asyncpg pool with no timeout, so an exhausted pool
+# hangs the request. Take the task's connection up front with a bound instead;
+# later db.* calls in the same task reuse it.
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+
+async def acquire_connection(db: Database):
+    conn = db.connection()
+    try:
+        await asyncio.wait_for(conn.__aenter__(), DB_POOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(503, "Database busy, retry later")
+    return conn
+
+@asynccontextmanager
+async def pooled(db: Database):
+    conn = await acquire_connection(db)
+    try:
+        yield conn
+    finally:
+        await conn.__aexit__()
+
+# --- Intake back-pressure ---
+# Cap concurrent intake transactions below the pool size; shed load with 503
+# once too many requests are already queued for a slot.
+_INTAKE_SEM = asyncio.Semaphore(int(os.getenv("EXO_INTAKE_CONCURRENCY", "16")))
+_INTAKE_MAX_WAITING = int(os.getenv("EXO_INTAKE_MAX_WAITING", "64"))
+_intake_waiting = 0
+
+@asynccontextmanager
+async def intake_slot():
+    global _intake_waiting
+    if _INTAKE_SEM.locked() and _intake_waiting >= _INTAKE_MAX_WAITING:
+        raise HTTPException(503, "Intake busy, retry later")
+    _intake_waiting += 1
+    try:
+        await _INTAKE_SEM.acquire()
+    finally:
+        _intake_waiting -= 1
+    try:
+        yield
+    finally:
+        _INTAKE_SEM.release()
+
+# --- Audit event writer ---
+# Intake INGEST events are audit-only, so they don't need to land before the 201.
+# Handlers enqueue (id, block_id, table_name, event_type, payload) tuples; one
+# background task COPYs them in batches of up to EVENT_BATCH_MAX or every
+# EVENT_BATCH_WAIT seconds. The queue is bounded so a stalled writer pushes back.
+EVENT_COLUMNS = ["id", "block_id", "table_name", "event_type", "payload"]
+EVENT_BATCH_MAX = 500
+EVENT_BATCH_WAIT = 0.1
+event_queue: asyncio.Queue = asyncio.Queue(maxsize=int(os.getenv("EXO_EVENT_QUEUE_MAX", "10000")))
+_event_task: Optional[asyncio.Task] = None
+
+async def write_events(db: Database, batch: list):
+    async with db.connection() as conn:
+        await conn.raw_connection.copy_records_to_table(
+            "exo_block_events", records=batch, columns=EVENT_COLUMNS
+        )
+
+_STOP = object()  # queued by stop_event_writer; the writer exits after writing its batch
+
+async def drain_events(db: Database):
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        ev = await event_queue.get()
+        if ev is _STOP:
+            return
+        batch = [ev]
+        deadline = loop.time() + EVENT_BATCH_WAIT
+        while len(batch) < EVENT_BATCH_MAX:
+            try:
+                ev = await asyncio.wait_for(event_queue.get(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                break
+            if ev is _STOP:
+                stopping = True
+                break
+            batch.append(ev)
+        try:
+            await write_events(db, batch)
+        except Exception:
+            logger.exception("Dropped %d exo_block_events", len(batch))
+
+def start_event_writer(db: Database):
+    global _event_task
+    _event_task = asyncio.create_task(drain_events(db))
+
+async def stop_event_writer(db: Database):
+    """Let the writer finish the batch it holds, then flush anything queued after it."""
+    global _event_task
+    if _event_task and not _event_task.done():
+        await event_queue.put(_STOP)
+        await _event_task
+    _event_task = None
+    batch = []
+    while not event_queue.empty():
+        ev = event_queue.get_nowait()
+        if ev is not _STOP:
+            batch.append(ev)
+    for chunk in chunked(batch, EVENT_BATCH_MAX):
+        await write_events(db, chunk)
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
-db: Database = Database(DATABASE_URL)
+# --- Manager auth: Bearer JWT (HS256) with role=manager ---
+# Token contract for whoever issues manager tokens (nothing in this repo mints them):
+#   Authorization: Bearer <JWT signed HS256 with EXO_MANAGER_JWT_SECRET>
+#   claims: "role": "manager" (required, else 403) and "exp" (required, else 401);
+#   keep exp short, a leaked token works until it expires.
+# async with no awaits: FastAPI runs it inline (sync deps go through the
+# threadpool) and caches the result for the rest of the request.
+MANAGER_JWT_SECRET = os.getenv("EXO_MANAGER_JWT_SECRET")
+_JWT = jwt.PyJWT()
 
-# Optional: dependency for manager auth (JWT or session)
-def manager_auth(request: Request):
-    # Reuse your BRidge auth (bearer/session). Raise 401 if not manager.
-    return True
+async def manager_auth(request: Request) -> dict:
+    if not MANAGER_JWT_SECRET:
+        raise HTTPException(500, "Manager auth not configured")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(401, "Missing bearer token", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        claims = _JWT.decode(token, MANAGER_JWT_SECRET, algorithms=["HS256"],
+                             options={"require": ["exp"]})
+    except jwt.InvalidTokenError:
+        raise HTTPException(401, "Invalid token", headers={"WWW-Authenticate": "Bearer"})
+    if claims.get("role") != "manager":
+        raise HTTPException(403, "Manager role required")
+    return claims
 
 # --- Schemas ---
 class Builder(BaseModel):
@@ -84,67 +235,141 @@ class ExoPayload(BaseModel):
     signature: Optional[str] = None
     qr_slug: Optional[str] = None
 
+# --- Bulk insert helpers ---
+# One INSERT per chunk instead of one round-trip per row. Rows go in as one array
+# per column and come back out through unnest(), so the SQL text is the same for
+# every chunk size: asyncpg prepares it once per connection.
+# clock_timestamp() (not now()) so rows in one batch get distinct, ordered created_at.
+# JSON columns pass through ::json, which assigns to text, json or jsonb alike.
+BULK_CHUNK = 500
+
+STAGING_INSERT = text("""
+  INSERT INTO exo_blocks_staging(
+    id,idempotency_key,external_ref,builder_id,builder_name,org_id,
+    location_label,latitude,longitude,
+    built_at,cured_at,installed_at,status,
+    co2_offset_lbs,volume_ft3,height_in,total_cost_usd,
+    method,core_fill,structure_notes,materials,batches,
+    photo_urls,doc_urls,signature,qr_slug,created_at,updated_at
+  )
+  SELECT
+    id,idem,ext,builder_id,builder_name,org_id,
+    loc,lat,lng,
+    built,cured,installed,status,
+    co2,vol,height,cost,
+    method,core_fill::json,notes,materials::json,batches::json,
+    photos::json,docs::json,signature,qr,clock_timestamp(),clock_timestamp()
+  FROM unnest(
+    CAST(:id AS uuid[]), CAST(:idem AS text[]), CAST(:ext AS text[]),
+    CAST(:builder_id AS uuid[]), CAST(:builder_name AS text[]), CAST(:org_id AS uuid[]),
+    CAST(:loc AS text[]), CAST(:lat AS float8[]), CAST(:lng AS float8[]),
+    CAST(:built AS timestamptz[]), CAST(:cured AS timestamptz[]), CAST(:installed AS timestamptz[]),
+    CAST(:status AS text[]),
+    CAST(:co2 AS float8[]), CAST(:vol AS numeric[]), CAST(:height AS numeric[]), CAST(:cost AS numeric[]),
+    CAST(:method AS text[]), CAST(:core_fill AS text[]), CAST(:notes AS text[]),
+    CAST(:materials AS text[]), CAST(:batches AS text[]),
+    CAST(:photos AS text[]), CAST(:docs AS text[]), CAST(:signature AS text[]), CAST(:qr AS text[])
+  ) AS u(
+    id,idem,ext,builder_id,builder_name,org_id,
+    loc,lat,lng,
+    built,cured,installed,status,
+    co2,vol,height,cost,
+    method,core_fill,notes,materials,batches,
+    photos,docs,signature,qr
+  )
+  ON CONFLICT (idempotency_key) DO NOTHING RETURNING id
+""")
+
+def chunked(seq: list, size: int):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+def bulk_params(rows: List[dict]) -> dict:
+    """Row dicts -> one list per column, for the unnest() arrays."""
+    return {k: [row[k] for row in rows] for k in rows[0]}
+
+def json_text(value) -> str:
+    # orjson refuses ints outside 64 bits, which pydantic lets through in the free-form
+    # dict fields; stdlib json handles them, so fall back rather than 500.
+    try:
+        return orjson.dumps(value).decode()
+    except orjson.JSONEncodeError:
+        return json.dumps(value)
+
+def uuid4_batch(n: int) -> List[uuid.UUID]:
+    """n random (v4) UUIDs from a single os.urandom call instead of one per uuid4()."""
+    buf = os.urandom(16 * n)
+    return [uuid.UUID(bytes=buf[i:i + 16], version=4) for i in range(0, 16 * n, 16)]
+
+INTAKE_MAX_BODY = int(os.getenv("EXO_INTAKE_MAX_BODY", str(10 * 1024 * 1024)))
+
+# Validated inline: pydantic-core holds the GIL for the whole validate_json call,
+# so a worker thread would stall the loop just as long and only add a hop.
+_EXO_LIST = TypeAdapter(List[ExoPayload])
+_JSON_ARRAY_RE = re.compile(rb"[ \t\r\n]*\[")  # JSON whitespace only; no copy of the body
+
+def validate_body(raw: bytes) -> List[ExoPayload]:
+    """Parse + validate in one pass (pydantic-core's JSON parser); body is one payload or a list."""
+    if _JSON_ARRAY_RE.match(raw):
+        return _EXO_LIST.validate_json(raw)
+    return [ExoPayload.model_validate_json(raw)]
+
 # --- 2.1 Builder intake (HMAC + idempotency) ---
 @exo_router.post(
     "/intake",
     summary="Builder intake (staging)",
-    description="Builders POST signed payloads. Idempotent on idempotency_key. Requires X-Signature HMAC.",
+    description="Builders POST signed payloads. Idempotent on idempotency_key. Requires X-Signature HMAC or X-Signature-B3 keyed BLAKE3.",
     status_code=201,
 )
 async def intake_exo_blocks(
     request: Request,
-    x_signature: str = Header(..., alias="X-Signature")
+    x_signature: Optional[str] = Header(None, alias="X-Signature"),
+    x_signature_b3: Optional[str] = Header(None, alias="X-Signature-B3"),
+    db: Database = Depends(get_db),
 ):
-    raw = await request.body()
-    if not verify_hmac(raw, x_signature):
+    if not (x_signature or x_signature_b3):
         raise HTTPException(status_code=401, detail="Invalid signature")
+    if int(request.headers.get("content-length") or 0) > INTAKE_MAX_BODY:
+        raise HTTPException(413, "Payload too large")
 
-    try:
-        payload = json.loads(raw)
-    except Exception:
-        raise HTTPException(400, "Invalid JSON")
+    # hash while receiving; never buffer more than INTAKE_MAX_BODY
+    mac = new_b3_mac() if x_signature_b3 else new_hmac()
+    buf = bytearray()
+    async for chunk in request.stream():
+        if len(buf) + len(chunk) > INTAKE_MAX_BODY:
+            raise HTTPException(413, "Payload too large")
+        mac.update(chunk)
+        buf.extend(chunk)
+    if not signature_ok(mac, x_signature_b3 or x_signature):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+    raw = bytes(buf)
 
-    items = payload if isinstance(payload, list) else [payload]
     created = []
 
-    async with db.transaction():
-        for it in items:
-            data = ExoPayload(**it)  # validation
-            # upsert-like idempotency: skip if exists
-            exists = await db.fetch_one(
-                "SELECT id FROM exo_blocks_staging WHERE idempotency_key=:k",
-                {"k": data.idempotency_key},
-            )
-            if exists:
-                continue
-
-            bid = uuid.uuid4()
-            created.append(str(bid))
-            q = text("""
-              INSERT INTO exo_blocks_staging(
-                id,idempotency_key,external_ref,builder_id,builder_name,org_id,
-                location_label,latitude,longitude,
-                built_at,cured_at,installed_at,status,
-                co2_offset_lbs,volume_ft3,height_in,total_cost_usd,
-                method,core_fill,structure_notes,materials,batches,
-                photo_urls,doc_urls,signature,qr_slug,created_at,updated_at
-              ) VALUES(
-                :id,:idem,:ext,:builder_id,:builder_name,:org_id,
-                :loc,:lat,:lng,
-                :built,:cured,:installed,:status,
-                :co2,:vol,:height,:cost,
-                :method,:core_fill,:notes,:materials,:batches,
-                :photos,:docs,:signature,:qr,now(),now()
-              )
-            """)
+    # validate everything before taking a pool slot so the transaction stays short
+    try:
+        datas = validate_body(raw)
+    except ValidationError as e:
+        errors = e.errors()
+        if any(err["type"] == "json_invalid" for err in errors):
+            raise HTTPException(400, "Invalid JSON")
+        raise RequestValidationError(errors)
+
+    async with intake_slot(), pooled(db), db.transaction():
+        # block id + event id per item
+        new_ids = iter(uuid4_batch(2 * len(datas)))
+        rows, statuses = [], {}
+        for data in datas:
+            bid = next(new_ids)
+            statuses[bid] = data.status
             m = data.materials.model_dump()
-            await db.execute(q, {
+            rows.append({
                 "id": bid,
                 "idem": data.idempotency_key,
                 "ext": data.external_ref,
-                "builder_id": str(data.builder.id) if data.builder.id else None,
+                "builder_id": data.builder.id,
                 "builder_name": data.builder.name,
-                "org_id": str(data.builder.org_id) if data.builder.org_id else None,
+                "org_id": data.builder.org_id,
                 "loc": (data.location.label if data.location else None),
                 "lat": (data.location.latitude if data.location else None),
                 "lng": (data.location.longitude if data.location else None),
@@ -157,53 +382,115 @@ async def intake_exo_blocks(
                 "height": data.metrics.get("height_in"),
                 "cost": data.metrics.get("total_cost_usd"),
                 "method": data.method,
-                "core_fill": json.dumps(data.core_fill),
+                "core_fill": json_text(data.core_fill),
                 "notes": data.structure_notes,
-                "materials": json.dumps(m),
-                "batches": json.dumps(data.batches),
-                "photos": json.dumps((data.media.photo_urls if data.media else None)),
-                "docs": json.dumps((data.media.doc_urls if data.media else None)),
+                "materials": json_text(m),
+                "batches": json_text(data.batches),
+                "photos": json_text((data.media.photo_urls if data.media else None)),
+                "docs": json_text((data.media.doc_urls if data.media else None)),
                 "signature": data.signature,
                 "qr": data.qr_slug,
             })
 
-            await db.execute(
-              "INSERT INTO exo_block_events(id,block_id,table_name,event_type,payload) "
-              "VALUES(:id,:bid,'staging','INGEST',:payload)",
-              {"id": uuid.uuid4(), "bid": bid, "payload": json.dumps({"status": data.status})}
-            )
+        # idempotency: keys already staged hit the unique index and are skipped;
+        # only rows actually inserted come back from RETURNING
+        events = []
+        for chunk in chunked(rows, BULK_CHUNK):
+            inserted = await db.fetch_all(STAGING_INSERT.bindparams(**bulk_params(chunk)))
+            for r in inserted:
+                created.append(str(r["id"]))
+                events.append((next(new_ids), r["id"], "staging", "INGEST",
+                               json_text({"status": statuses[r["id"]]})))
+
+    # audit events are written by the background writer, after the commit
+    for ev in events:
+        await event_queue.put(ev)
 
     return {"created": created}
 
 # --- 2.2 Manager: list staging with filters + pagination ---
+# Keyset pagination on (created_at, id): rows in one intake batch can share created_at.
+def encode_cursor(created_at: datetime, id) -> str:
+    return f"{created_at.isoformat()}|{id}"
+
+@lru_cache(maxsize=None)
+def staging_list_sql(has_rs: bool, has_er: bool, has_erp: bool, has_cursor: bool):
+    """Page query for each filter combination, compiled once.
+
+    The first page (no cursor) carries the total in a "total_count" column so it
+    costs no extra round-trip: an exact count(*) OVER () when filtered, the
+    planner's reltuples estimate when not. Later pages skip it.
+    """
+    where = ["1=1"]
+    if has_rs:
+        where.append("review_status=:rs")
+    if has_er:
+        where.append("external_ref ILIKE :er")
+    if has_erp:
+        where.append("external_ref LIKE :erp")
+    filtered = len(where) > 1
+    if has_cursor:
+        where.append("(created_at, id) < (:c_ts, :c_id)")
+        total_col = ""
+    elif filtered:
+        total_col = ", count(*) OVER () AS total_count"
+    else:
+        total_col = (", (SELECT reltuples::bigint FROM pg_class "
+                     "WHERE oid = 'exo_blocks_staging'::regclass) AS total_count")
+    return text(
+        f"SELECT *{total_col} FROM exo_blocks_staging WHERE {' AND '.join(where)} "
+        "ORDER BY created_at DESC, id DESC LIMIT :lim"
+    )
+
+def like_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def decode_cursor(cursor: str):
+    try:
+        ts, cid = cursor.split("|", 1)
+        return datetime.fromisoformat(ts), uuid.UUID(cid)
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
 @exo_router.get(
     "/staging",
     summary="List staging items (manager)",
-    description="Filter by review_status, external_ref; paginate with limit/offset.",
+    description="Filter by review_status, external_ref (substring) or external_ref_prefix; paginate with limit + cursor (next_cursor from the previous page). total is returned on the first page only (estimated when unfiltered).",
 )
 async def list_staging(
     review_status: Optional[str] = Query(None, pattern="^(PENDING|APPROVED|REJECTED)$"),
     external_ref: Optional[str] = None,
+    external_ref_prefix: Optional[str] = None,
     limit: int = Query(50, ge=1, le=500),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     _=Depends(manager_auth),
+    db: Database = Depends(get_db),
 ):
-    where = ["1=1"]
     params = {}
     if review_status:
-        where.append("review_status=:rs"); params["rs"] = review_status
+        params["rs"] = review_status
     if external_ref:
-        where.append("external_ref ILIKE :er"); params["er"] = f"%{external_ref}%"
-
-    rows = await db.fetch_all(
-        f"SELECT * FROM exo_blocks_staging WHERE {' AND '.join(where)} "
-        "ORDER BY created_at DESC LIMIT :lim OFFSET :off",
-        {**params, "lim": limit, "off": offset}
+        params["er"] = f"%{external_ref}%"
+    if external_ref_prefix:
+        params["erp"] = like_escape(external_ref_prefix) + "%"
+    page_q = staging_list_sql(
+        bool(review_status), bool(external_ref), bool(external_ref_prefix), bool(cursor)
     )
-    total = await db.fetch_val(
-        f"SELECT count(*) FROM exo_blocks_staging WHERE {' AND '.join(where)}", params
-    )
-    return {"total": total, "limit": limit, "offset": offset, "items": [dict(r) for r in rows]}
+
+    page_params = {**params, "lim": limit}
+    if cursor:
+        page_params["c_ts"], page_params["c_id"] = decode_cursor(cursor)
+
+    async with pooled(db):
+        rows = await db.fetch_all(page_q.bindparams(**page_params))
+    items = [dict(r) for r in rows]
+    total = None  # only reported on the first page
+    if not cursor:
+        totals = [it.pop("total_count") for it in items]
+        # a short first page is the exact total, whatever the estimate says
+        total = len(items) if len(items) < limit else max(totals[0], len(items))
+    next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if len(rows) == limit else None
+    return {"total": total, "limit": limit, "next_cursor": next_cursor, "items": items}
 
 # --- 2.3 Manager: approve / reject / status tweak ---
 class ReviewAction(BaseModel):
@@ -211,6 +498,58 @@ class ReviewAction(BaseModel):
     reviewer_id: Optional[uuid.UUID] = None
     reviewer_name: Optional[str] = None
 
+# Each action is one statement: the write and its event share a snapshot and commit
+# atomically, and an empty "upd" means the id doesn't exist. UUID binds are typed
+# so the SQL text (and asyncpg's cached statement) doesn't vary with None.
+Q_REJECT = text("""
+  WITH upd AS (
+    UPDATE exo_blocks_staging
+    SET review_status='REJECTED', reviewer_id=:rid, reviewer_name=:rname, reviewed_at=now(), updated_at=now()
+    WHERE id=:id RETURNING id
+  ), ev AS (
+    INSERT INTO exo_block_events(id,block_id,table_name,event_type)
+    SELECT :eid, id, 'staging', 'REJECT' FROM upd
+  )
+  SELECT count(*) FROM upd
+""").bindparams(bindparam("id", type_=Uuid), bindparam("eid", type_=Uuid), bindparam("rid", type_=Uuid))
+Q_MARK_CURED = text("""
+  WITH upd AS (
+    UPDATE exo_blocks_staging SET status='cured', cured_at=now(), updated_at=now()
+    WHERE id=:id RETURNING id
+  ), ev AS (
+    INSERT INTO exo_block_events(id,block_id,table_name,event_type)
+    SELECT :eid, id, 'staging', 'STATUS_CHANGE' FROM upd
+  )
+  SELECT count(*) FROM upd
+""").bindparams(bindparam("id", type_=Uuid), bindparam("eid", type_=Uuid))
+Q_APPROVE = text("""
+  WITH moved AS (
+    INSERT INTO exo_blocks(
+      id, external_ref, builder_id, builder_name, org_id, location_label, latitude, longitude,
+      built_at, cured_at, installed_at, status,
+      co2_offset_lbs, volume_ft3, height_in, total_cost_usd,
+      method, core_fill, structure_notes, materials, batches,
+      photo_urls, doc_urls, signature, qr_slug, created_at, updated_at
+    )
+    SELECT
+      id, external_ref, builder_id, builder_name, org_id, location_label, latitude, longitude,
+      built_at, cured_at, installed_at, status,
+      co2_offset_lbs, volume_ft3, height_in, total_cost_usd,
+      method, core_fill, structure_notes, materials, batches,
+      photo_urls, doc_urls, signature, qr_slug, now(), now()
+    FROM exo_blocks_staging WHERE id=:id
+    ON CONFLICT (external_ref) DO NOTHING
+  ), upd AS (
+    UPDATE exo_blocks_staging
+    SET review_status='APPROVED', reviewer_id=:rid, reviewer_name=:rname, reviewed_at=now(), updated_at=now()
+    WHERE id=:id RETURNING id
+  ), ev AS (
+    INSERT INTO exo_block_events(id,block_id,table_name,event_type)
+    SELECT :eid, id, 'final', 'APPROVE' FROM upd
+  )
+  SELECT count(*) FROM upd
+""").bindparams(bindparam("id", type_=Uuid), bindparam("eid", type_=Uuid), bindparam("rid", type_=Uuid))
+
 @exo_router.patch(
     "/staging/{id}",
     summary="Review a staging item",
@@ -220,84 +559,78 @@ async def review_item(
     id: uuid.UUID,
     body: ReviewAction,
     _=Depends(manager_auth),
+    db: Database = Depends(get_db),
 ):
-    row = await db.fetch_one("SELECT * FROM exo_blocks_staging WHERE id=:id", {"id": str(id)})
-    if not row:
-        raise HTTPException(404, "Not found")
+    reviewer = {"rid": body.reviewer_id, "rname": body.reviewer_name}
+    ids = {"id": id, "eid": uuid.uuid4()}
 
     if body.action == "REJECT":
-        await db.execute(
-            "UPDATE exo_blocks_staging SET review_status='REJECTED', reviewer_id=:rid, reviewer_name=:rname, reviewed_at=now(), updated_at=now() WHERE id=:id",
-            {"rid": str(body.reviewer_id) if body.reviewer_id else None, "rname": body.reviewer_name, "id": str(id)}
-        )
-        await db.execute("INSERT INTO exo_block_events(id,block_id,table_name,event_type) VALUES(:id,:bid,'staging','REJECT')",
-                         {"id": uuid.uuid4(), "bid": str(id)})
-        return {"ok": True, "state": "REJECTED"}
-
-    if body.action == "MARK_CURED":
-        await db.execute(
-            "UPDATE exo_blocks_staging SET status='cured', cured_at=now(), updated_at=now() WHERE id=:id",
-            {"id": str(id)}
-        )
-        await db.execute("INSERT INTO exo_block_events(id,block_id,table_name,event_type) VALUES(:id,:bid,'staging','STATUS_CHANGE')",
-                         {"id": uuid.uuid4(), "bid": str(id)})
-        return {"ok": True, "state": "cured"}
-
-    # APPROVE => promote to final
-    async with db.transaction():
-        # insert into final
-        await db.execute(text("""
-          INSERT INTO exo_blocks(
-            id, external_ref, builder_id, builder_name, org_id, location_label, latitude, longitude,
-            built_at, cured_at, installed_at, status,
-            co2_offset_lbs, volume_ft3, height_in, total_cost_usd,
-            method, core_fill, structure_notes, materials, batches,
-            photo_urls, doc_urls, signature, qr_slug, created_at, updated_at
-          )
-          SELECT
-            id, external_ref, builder_id, builder_name, org_id, location_label, latitude, longitude,
-            built_at, cured_at, installed_at, status,
-            co2_offset_lbs, volume_ft3, height_in, total_cost_usd,
-            method, core_fill, structure_notes, materials, batches,
-            photo_urls, doc_urls, signature, qr_slug, now(), now()
-          FROM exo_blocks_staging WHERE id=:id
-          ON CONFLICT (external_ref) DO NOTHING
-        """), {"id": str(id)})
-
-        await db.execute(
-            "UPDATE exo_blocks_staging SET review_status='APPROVED', reviewer_id=:rid, reviewer_name=:rname, reviewed_at=now(), updated_at=now() WHERE id=:id",
-            {"rid": str(body.reviewer_id) if body.reviewer_id else None, "rname": body.reviewer_name, "id": str(id)}
-        )
-        await db.execute("INSERT INTO exo_block_events(id,block_id,table_name,event_type) VALUES(:id,:bid,'final','APPROVE')",
-                         {"id": uuid.uuid4(), "bid": str(id)})
+        q, state = Q_REJECT.bindparams(**ids, **reviewer), "REJECTED"
+    elif body.action == "MARK_CURED":
+        q, state = Q_MARK_CURED.bindparams(**ids), "cured"
+    else:  # APPROVE => promote to final
+        q, state = Q_APPROVE.bindparams(**ids, **reviewer), "APPROVED"
 
-    return {"ok": True, "state": "APPROVED"}
+    async with pooled(db):
+        found = await db.fetch_val(q)
+    if not found:
+        raise HTTPException(404, "Not found")
+    return {"ok": True, "state": state}
 
 # --- 2.4 Export / push approved to Dossier dump (JSON download or push) ---
+# Row shaping happens in Postgres; each row arrives as ready-to-send JSON text.
+# JSON columns are cast so they nest as objects, matching the ExoPayload shape.
+EXPORT_APPROVED = text("""
+  SELECT json_build_object(
+    'idempotency_key', idempotency_key,
+    'external_ref', external_ref,
+    'builder', json_build_object('id', builder_id, 'name', builder_name, 'org_id', org_id),
+    'location', json_build_object('label', location_label, 'latitude', latitude, 'longitude', longitude),
+    'timestamps', json_build_object('built_at', built_at, 'cured_at', cured_at, 'installed_at', installed_at),
+    'status', status,
+    'metrics', json_build_object('co2_offset_lbs', co2_offset_lbs, 'volume_ft3', volume_ft3,
+                                 'height_in', height_in, 'total_cost_usd', total_cost_usd),
+    'method', method,
+    'core_fill', core_fill::json,
+    'materials', materials::json,
+    'batches', batches::json,
+    'structure_notes', structure_notes,
+    'media', json_build_object('photo_urls', photo_urls::json, 'doc_urls', doc_urls::json),
+    'signature', signature,
+    'qr_slug', qr_slug
+  )::text AS payload
+  FROM exo_blocks_staging
+  WHERE review_status='APPROVED'
+  ORDER BY reviewed_at DESC
+""")
+
 @exo_router.get(
     "/staging/export",
     summary="Export APPROVED items as dossier_dump.json",
     description="Returns a JSON array compatible with /ingest/exo-blocks.",
 )
-async def export_approved(_=Depends(manager_auth)):
-    rows = await db.fetch_all("SELECT * FROM exo_blocks_staging WHERE review_status='APPROVED' ORDER BY reviewed_at DESC")
-    items = []
-    for r in rows:
-        items.append({
-            "idempotency_key": r["idempotency_key"],
-            "external_ref": r["external_ref"],
-            "builder": {"id": r["builder_id"], "name": r["builder_name"], "org_id": r["org_id"]},
-            "location": {"label": r["location_label"], "latitude": r["latitude"], "longitude": r["longitude"]},
-            "timestamps": {"built_at": r["built_at"], "cured_at": r["cured_at"], "installed_at": r["installed_at"]},
-            "status": r["status"],
-            "metrics": {"co2_offset_lbs": r["co2_offset_lbs"], "volume_ft3": r["volume_ft3"], "height_in": r["height_in"], "total_cost_usd": r["total_cost_usd"]},
-            "method": r["method"],
-            "core_fill": r["core_fill"],
-            "materials": r["materials"],
-            "batches": r["batches"],
-            "structure_notes": r["structure_notes"],
-            "media": {"photo_urls": r["photo_urls"], "doc_urls": r["doc_urls"]},
-            "signature": r["signature"],
-            "qr_slug": r["qr_slug"],
-        })
-    return items
+async def export_approved(_=Depends(manager_auth), db: Database = Depends(get_db)):
+    # acquired here so a busy pool is still a 503, not a broken stream
+    conn = await acquire_connection(db)
+    released = False
+
+    async def release():
+        # runs from gen()'s finally and as the response background task, whichever comes first
+        nonlocal released
+        if not released:
+            released = True
+            await conn.__aexit__()
+
+    async def gen():
+        try:
+            # server-side cursor: one row in flight, no full list in memory
+            yield b"["
+            first = True
+            async for r in conn.iterate(EXPORT_APPROVED):
+                yield (b"" if first else b",") + r["payload"].encode()
+                first = False
+            yield b"]"
+        finally:
+            await release()
+
+    return StreamingResponse(gen(), media_type="application/json", background=BackgroundTask(release))